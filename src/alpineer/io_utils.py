@@ -3,11 +3,36 @@ import os
 import pathlib
 import re
 import warnings
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
 
 from alpineer import misc_utils
 from alpineer.settings import EXTENSION_TYPES
 
+# tokenizer for the fuzzy substring match, compiled once at import
+_TOKEN_RE = re.compile("[^a-zA-Z0-9]")
+
+# known extensions, frozen once at import so membership is a single hash lookup per file
+_KNOWN_EXTENSIONS = frozenset(itertools.chain(*EXTENSION_TYPES.values()))
+
+
+def _validate_path(path):
+    """Verifies that a single path exists, raising FileNotFoundError otherwise"""
+    # ask forgiveness: one stat syscall covers the common case of a valid path,
+    # with os.path.exists semantics (any OSError counts as missing)
+    try:
+        os.stat(path)
+    except OSError:
+        # only walk the parents of a path that is already known to be missing, to
+        # name the first bad component in the error
+        path_obj = pathlib.Path(path)
+        for parent in reversed(path_obj.parents):
+            if not os.path.exists(parent):
+                raise FileNotFoundError(
+                    f"A bad path, {path}, was provided.\n"
+                    f"The folder, {parent.name}, could not be found..."
+                ) from None
+        raise FileNotFoundError(f"The file/path, {path_obj.name}, could not be found...") from None
+
 
 def validate_paths(paths):
     """Verifies that paths exist and don't leave Docker's scope
@@ -21,24 +46,98 @@ def validate_paths(paths):
             Raised if any directory is out of scope or non-existent
     """
 
-    # if given a single path, convert to list
-    paths = misc_utils.make_iterable(paths, ignore_str=True)
+    # if given a single path, convert to list, and normalize everything to plain strings
+    # once so the downstream stat calls skip per-call __fspath__ dispatch
+    paths = [os.fspath(path) for path in misc_utils.make_iterable(paths, ignore_str=True)]
+
+    if len(paths) > 4:
+        # stat releases the GIL, so larger batches (e.g. one path per FOV on a networked
+        # filesystem) validate in parallel; futures are collected in submission order so
+        # the first bad path still raises first
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+            for future in [executor.submit(_validate_path, path) for path in paths]:
+                future.result()
+    else:
+        for path in paths:
+            _validate_path(path)
+
+
+def _iter_entries(dir_name, substrs=None, exact_match=False, ignore_hidden=True, dirs=False):
+    """Lazily yields entries in a directory matching at least one given substring
 
-    # if given a single path, convert to list
-    if not isinstance(paths, list):
-        paths = [paths]
+    Streaming from os.scandir means the first match can be produced before the OS has
+    finished enumerating the directory, and nothing is buffered for callers that only
+    iterate. Entries are yielded in directory order, each at most once.
+
+    Args:
+        dir_name (str):
+            Parent directory for entries of interest
+        substrs (str or list):
+            Substring matching criteria, defaults to None (all entries)
+        exact_match (bool):
+            If True, will match exact entry names. If False, will match substr patterns.
+        ignore_hidden (bool):
+            If True, will skip hidden entries. If False, will allow hidden entries to be
+            matched against the search substring.
+        dirs (bool):
+            If True, yields sub-directories instead of files.
 
-    for path in paths:
-        if not os.path.exists(path):
-            for parent in reversed(pathlib.Path(path).parents):
-                if not os.path.exists(parent):
-                    raise FileNotFoundError(
-                        f"A bad path, {path}, was provided.\n"
-                        f"The folder, {parent.name}, could not be found..."
-                    )
-            raise FileNotFoundError(
-                f"The file/path, {pathlib.Path(path).name}, could not be found..."
-            )
+    Yields:
+        str:
+            Entry names matching at least one of the substrings
+    """
+    # compile the matching criteria once, outside the scandir loop: exact matches become
+    # one hash lookup per entry and fuzzy token sets are built once per substring rather
+    # than once per (substring, entry) pair
+    suffixes = None
+    single_pattern = None
+    if isinstance(substrs, str):
+        # scalar substring: compile one criterion directly, skipping both the list wrap
+        # and the per-entry any() below
+        if exact_match:
+            substr_set = frozenset((substrs,))
+        elif substrs.startswith(".") and os.sep not in substrs:
+            suffixes = substrs
+        else:
+            single_pattern = frozenset(filter(bool, _TOKEN_RE.split(substrs)))
+    elif substrs is not None:
+        if exact_match:
+            substr_set = frozenset(substrs)
+        elif all(s.startswith(".") and os.sep not in s for s in substrs):
+            # substrs like ['.txt', '.out'] are extension filters: a tuple endswith is a
+            # single C-level suffix comparison per entry
+            suffixes = tuple(substrs)
+        else:
+            substr_patterns = [frozenset(filter(bool, _TOKEN_RE.split(s))) for s in substrs]
+
+    # scandir reuses the entry type returned by the OS directory listing, avoiding a
+    # stat call per entry
+    with os.scandir(dir_name) as entries:
+        for entry in entries:
+            if entry.is_dir() is not dirs:
+                continue
+
+            # entry names are never empty, so indexing beats the startswith method call
+            name = entry.name
+            if ignore_hidden and name[0] == ".":
+                continue
+
+            # default to yield all entries
+            if substrs is None:
+                yield name
+            elif exact_match:
+                if os.path.splitext(name)[0] in substr_set:
+                    yield name
+            elif suffixes is not None:
+                if name.endswith(suffixes):
+                    yield name
+            elif single_pattern is not None:
+                if set(filter(bool, _TOKEN_RE.split(name))).issuperset(single_pattern):
+                    yield name
+            else:
+                name_pattern = set(filter(bool, _TOKEN_RE.split(name)))
+                if any(name_pattern.issuperset(pattern) for pattern in substr_patterns):
+                    yield name
 
 
 def list_files(dir_name, substrs=None, exact_match=False, ignore_hidden=True):
@@ -58,39 +157,10 @@ def list_files(dir_name, substrs=None, exact_match=False, ignore_hidden=True):
 
     Returns:
         list:
-            List of files containing at least one of the substrings
+            Sorted list of files containing at least one of the substrings
     """
-    files = os.listdir(dir_name)
-    files = [file for file in files if not os.path.isdir(os.path.join(dir_name, file))]
-
-    # Filter out hidden files
-    if ignore_hidden:
-        files = [file for file in files if not file.startswith(".")]
-
-    # default to return all files
-    if substrs is None:
-        return files
-
-    # handle case where substrs is a single string (not wrapped in list)
-    if type(substrs) is not list:
-        substrs = [substrs]
-
-    if exact_match:
-        matches = [
-            file
-            for file in files
-            if any([substr == os.path.splitext(file)[0] for substr in substrs])
-        ]
-    else:
-        matches = []
-        for substr in substrs:
-            substr_pattern = list(filter(bool, re.split("[^a-zA-Z0-9]", substr)))
-            for file in files:
-                file_pattern = list(filter(bool, re.split("[^a-zA-Z0-9]", file)))
-                if set(substr_pattern).issubset(file_pattern):
-                    matches.append(file)
-
-    return matches
+    # sort once at the boundary so callers get deterministic ordering for free
+    return sorted(_iter_entries(dir_name, substrs, exact_match, ignore_hidden))
 
 
 def remove_file_extensions(files):
@@ -114,23 +184,24 @@ def remove_file_extensions(files):
     if files is None:
         return
 
-    # remove the file extension
-    names = [os.path.splitext(name) for name in files]
+    # remove the file extension in a single pass, one splitext call per file; names that
+    # still contain a '.' may not be processed correctly, so collect them as we go for
+    # one batched warning instead of a second scan
     names_corrected = []
-    extension_types: List[str] = list(itertools.chain(*EXTENSION_TYPES.values()))
-    for name in names:
-        # We want everything after the "." for the extension
-        ext = name[-1][1:]
-        if (ext in extension_types) or (len(ext) == 0):
+    bad_names = []
+    for name in files:
+        head, ext = os.path.splitext(name)
+        if (ext[1:] in _KNOWN_EXTENSIONS) or (len(ext) == 0):
             # If it is one of the extension types, only keep the filename.
             # Or there is no extension and the names are similar to ["fov1", "fov2", "fov3", ...]
-            names_corrected.append(name[:-1][0])
+            corrected = head
         else:
             # If `ext` not one of the specified file types, keep the value after the "."
-            names_corrected.append(name[:-1][0] + "." + name[-1][1])
+            corrected = head + ext
+        names_corrected.append(corrected)
+        if "." in corrected:
+            bad_names.append(corrected)
 
-    # identify names with '.' in them: these may not be processed correctly.
-    bad_names = [name for name in names_corrected if "." in name]
     if len(bad_names) > 0:
         warnings.warn(
             'These files still have "." in them after file extension removal: '
@@ -172,23 +243,32 @@ def extract_delimited_names(names, delimiter="_", delimiter_optional=True):
     if names is None:
         return
 
-    # check for bad files/folders
-    if delimiter is not None and not delimiter_optional:
-        no_delim = [delimiter not in name for name in names]
-        if any(no_delim):
-            print(
-                "The following files do not have the mandatory delimiter, "
-                f"'{delimiter}': "
-                f"{','.join([name for indx,name in enumerate(names) if no_delim[indx]])}"
-            )
-            warnings.warn("files without mandatory delimiter")
+    # str.partition requires a real separator; fall back to whitespace splitting like split
+    if delimiter is None:
+        return [name.split(delimiter)[0] for name in names]
+
+    # partition finds the prefix and whether the delimiter was present in one scan,
+    # so bad names are collected alongside the extraction itself
+    prefixes = []
+    no_delim = []
+    for name in names:
+        head, sep, _ = name.partition(delimiter)
+        if not sep:
+            no_delim.append(name)
+        prefixes.append(head)
 
-            return None
+    # check for bad files/folders
+    if no_delim and not delimiter_optional:
+        print(
+            "The following files do not have the mandatory delimiter, "
+            f"'{delimiter}': "
+            f"{','.join(no_delim)}"
+        )
+        warnings.warn("files without mandatory delimiter")
 
-    # now split on the delimiter as well
-    names = [name.split(delimiter)[0] for name in names]
+        return None
 
-    return names
+    return prefixes
 
 
 def list_folders(dir_name, substrs=None, exact_match=False, ignore_hidden=True):
@@ -208,37 +288,6 @@ def list_folders(dir_name, substrs=None, exact_match=False, ignore_hidden=True):
 
     Returns:
         list:
-            List of folders containing at least one of the substrings
+            Sorted list of folders containing at least one of the substrings
     """
-    files = os.listdir(dir_name)
-    folders = [file for file in files if os.path.isdir(os.path.join(dir_name, file))]
-
-    # Filter out hidden directories
-    if ignore_hidden:
-        folders = [folder for folder in folders if not folder.startswith(".")]
-
-    # default to return all files
-    if substrs is None:
-        return folders
-
-    # handle case where substrs is a single string (not wrapped in list)
-    if type(substrs) is not list:
-        substrs = [substrs]
-
-    # Exact match case
-    if exact_match:
-        matches = [
-            folder
-            for folder in folders
-            if any([substr == os.path.splitext(folder)[0] for substr in substrs])
-        ]
-    else:
-        matches = []
-        for substr in substrs:
-            substr_pattern = list(filter(bool, re.split("[^a-zA-Z0-9]", substr)))
-            for folder in folders:
-                folder_pattern = list(filter(bool, re.split("[^a-zA-Z0-9]", folder)))
-                if set(substr_pattern).issubset(folder_pattern):
-                    matches.append(folder)
-
-    return matches
+    return sorted(_iter_entries(dir_name, substrs, exact_match, ignore_hidden, dirs=True))
@@ -2,6 +2,7 @@ import os
 import pathlib
 import re
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, OrderedDict, Union
 
 import numpy as np
@@ -9,9 +10,85 @@ import skimage.io as io
 import xarray as xr
 import xmltodict
 from tifffile import TiffFile, TiffPageSeries, TiffWriter
+from tifffile import imread as tiff_imread
 
 from alpineer import image_utils, io_utils, misc_utils, tiff_utils
-from alpineer.settings import EXTENSION_TYPES
+from alpineer.settings import EXTENSION_TYPES, IMAGE_EXT_TUPLE
+
+# cap on reader threads: TIFF decompression releases the GIL, so reads scale with
+# worker count until storage bandwidth saturates
+MAX_IMAGE_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# tiled fov names end in RnCm; compiled once at import and anchored at the end so
+# match() makes a single pass per name
+_TILED_FOV_RE: re.Pattern = re.compile(r".*R\+?(\d+)C\+?(\d+)$")
+
+
+def _imread(path):
+    """Reads a single image, sending TIFFs straight to tifffile
+
+    Calling tifffile directly skips skimage's per-call plugin lookup and wrapper objects.
+    Other image types still go through skimage.
+
+    Args:
+        path (str):
+            path of the image file to read
+
+    Returns:
+        np.ndarray:
+            the decoded image data
+    """
+    if str(path).endswith((".tif", ".tiff")):
+        return tiff_imread(path)
+    return io.imread(path)
+
+
+def _max_image_shape(paths, default_shape):
+    """Finds the largest row/col dimensions across a set of image files
+
+    TIFF shapes are read from the IFD headers in parallel without decoding any pixel
+    data; non-TIFF files are assumed to match `default_shape`.
+
+    Args:
+        paths (list):
+            paths of the image files to size
+        default_shape (tuple):
+            shape assumed for files whose headers aren't probed
+
+    Returns:
+        tuple:
+            the maximum (rows, cols) across all files
+    """
+    max_rows, max_cols = default_shape[0], default_shape[1]
+
+    def _page_shape(path):
+        with TiffFile(path) as temp_tif:
+            return temp_tif.pages[0].shape
+
+    tiff_paths = [path for path in paths if path.endswith((".tif", ".tiff"))]
+    with ThreadPoolExecutor(max_workers=MAX_IMAGE_READ_WORKERS) as executor:
+        for shape in executor.map(_page_shape, tiff_paths):
+            max_rows = max(max_rows, shape[0])
+            max_cols = max(max_cols, shape[1])
+
+    return max_rows, max_cols
+
+
+def _check_for_negative_values(img_data):
+    """Warns if the loaded image data contains any negative values
+
+    Unsigned dtypes can never hold negative values, so the full-array scan is only run
+    for signed integer and floating point data.
+
+    Args:
+        img_data (np.ndarray):
+            the loaded image data to check
+    """
+    if np.issubdtype(img_data.dtype, np.signedinteger) or np.issubdtype(
+        img_data.dtype, np.floating
+    ):
+        if (img_data < 0).any():
+            warnings.warn("You have images with negative values loaded in.")
 
 
 def load_imgs_from_mibitiff(data_dir, mibitiff_files=None, channels=None, delimiter=None):
@@ -52,10 +129,11 @@ def load_imgs_from_mibitiff(data_dir, mibitiff_files=None, channels=None, delimi
 
     mibitiff_files = [os.path.join(data_dir, mt_file) for mt_file in mibitiff_files]
 
-    test_img = io.imread(mibitiff_files[0], plugin="tifffile")
-
-    # The dtype is always the type of the image being loaded in.
-    dtype = test_img.dtype
+    # The dtype is always the type of the image being loaded in. Probe it from the first
+    # file's header rather than decoding every page of the file.
+    with TiffFile(mibitiff_files[0]) as test_tiff:
+        dtype = test_tiff.pages[0].dtype
+        test_shape = test_tiff.pages[0].shape
 
     # if no channels specified, get them from first MIBItiff file
     if channels is None:
@@ -65,16 +143,19 @@ def load_imgs_from_mibitiff(data_dir, mibitiff_files=None, channels=None, delimi
     if len(channels) == 0:
         raise ValueError("No channels provided in channels list")
 
-    # extract images from MIBItiff file
-    img_data = []
-    for mibitiff_file in mibitiff_files:
-        img_data.append(tiff_utils.read_mibitiff(mibitiff_file, channels)[0])
-    img_data = np.stack(img_data, axis=0)
+    # extract images from MIBItiff files, decoding files in parallel into a pre-allocated
+    # output buffer rather than stacking (and copying) the per-fov arrays afterwards
+    img_data = np.empty(
+        (len(mibitiff_files), test_shape[0], test_shape[1], len(channels)), dtype=dtype
+    )
 
-    if np.min(img_data) < 0:
-        warnings.warn("You have images with negative values loaded in.")
+    def _read_mibitiff(fov):
+        img_data[fov] = tiff_utils.read_mibitiff(mibitiff_files[fov], channels)[0]
 
-    img_data = img_data.astype(dtype)
+    with ThreadPoolExecutor(max_workers=MAX_IMAGE_READ_WORKERS) as executor:
+        list(executor.map(_read_mibitiff, range(len(mibitiff_files))))
+
+    _check_for_negative_values(img_data)
 
     # create xarray with image data
     img_xr = xr.DataArray(
@@ -137,7 +218,7 @@ def load_imgs_from_tree(
         # if taking all channels from directory, sort them alphabetically
         channels.sort()
     # otherwise, fill channel names with correct file extension
-    elif not all([img.endswith(tuple(EXTENSION_TYPES["IMAGE"])) for img in channels]):
+    elif not all(img.endswith(IMAGE_EXT_TUPLE) for img in channels):
         # need this to reorder channels back because list_files may mess up the ordering
         channels_no_delim = io_utils.remove_file_extensions(channels)
 
@@ -147,15 +228,13 @@ def load_imgs_from_tree(
             exact_match=True,
         )
 
-        # get the corresponding indices found in channels_no_delim
-        channels_indices = [
-            channels_no_delim.index(io_utils.remove_file_extensions([chan])[0])
-            for chan in all_channels
-        ]
-
-        # verify if channels from user input are present in `all_channels`
+        # strip the extensions of all found channels in one batch
         all_channels_no_delim = io_utils.remove_file_extensions(all_channels)
 
+        # get the corresponding indices found in channels_no_delim via an O(1) lookup
+        channel_order = {chan: i for i, chan in enumerate(channels_no_delim)}
+        channels_indices = [channel_order[chan] for chan in all_channels_no_delim]
+
         misc_utils.verify_same_elements(
             all_channels_in_folder=all_channels_no_delim, all_channels_detected=channels_no_delim
         )
@@ -165,33 +244,58 @@ def load_imgs_from_tree(
     if len(channels) == 0:
         raise ValueError(f"No images found in designated folder, {os.path.join(data_dir, fovs[0])}")
 
-    test_img = io.imread(os.path.join(data_dir, fovs[0], img_sub_folder, channels[0]))
+    test_img = _imread(os.path.join(data_dir, fovs[0], img_sub_folder, channels[0]))
 
     # The dtype is always the type of the image being loaded in.
     dtype = test_img.dtype
 
+    # the per-fov directory is joined only once, with the job list built up front
+    base_dirs = [os.path.join(data_dir, fov_name, img_sub_folder) for fov_name in fovs]
+    jobs = [
+        (fov, img, os.path.join(base_dirs[fov], channels[img]))
+        for fov in range(len(fovs))
+        for img in range(len(channels))
+    ]
+
     if max_image_size is not None:
-        img_data = np.zeros((len(fovs), max_image_size, max_image_size, len(channels)), dtype=dtype)
+        row_size = col_size = max_image_size
     else:
-        img_data = np.zeros(
-            (len(fovs), test_img.shape[0], test_img.shape[1], len(channels)), dtype=dtype
+        # images are not guaranteed to share a shape: scan the TIFF headers (no pixel
+        # decode) for the largest dimensions, so smaller images get zero-padded
+        row_size, col_size = _max_image_shape(
+            [path for _, _, path in jobs], default_shape=test_img.shape
         )
 
-    for fov in range(len(fovs)):
-        for img in range(len(channels)):
-            if max_image_size is not None:
-                temp_img = io.imread(
-                    os.path.join(data_dir, fovs[fov], img_sub_folder, channels[img])
-                )
-                img_data[fov, : temp_img.shape[0], : temp_img.shape[1], img] = temp_img
-            else:
-                img_data[fov, :, :, img] = io.imread(
-                    os.path.join(data_dir, fovs[fov], img_sub_folder, channels[img])
-                )
+    img_data = np.zeros((len(fovs), row_size, col_size, len(channels)), dtype=dtype)
+
+    # read all (fov, channel) files in parallel, each decoded array is written into its
+    # own pre-allocated slot of img_data
+
+    def _read_into_slot(job):
+        fov, img, path = job
+        if path.endswith((".tif", ".tiff")):
+            with TiffFile(path) as temp_tif:
+                temp_page = temp_tif.pages[0]
+                rows, cols = temp_page.shape[0], temp_page.shape[1]
+                dest = img_data[fov, :rows, :cols, img]
+                if dest.flags.c_contiguous:
+                    # decode straight into the destination slice, skipping the
+                    # intermediate per-channel allocation and copy
+                    temp_page.asarray(out=dest)
+                else:
+                    # strided slices (multiple channels or padded images) can't be
+                    # handed to tifffile: its uncompressed path reads into the buffer
+                    # directly, which requires contiguous memory
+                    dest[:] = temp_page.asarray()
+        else:
+            temp_img = _imread(path)
+            img_data[fov, : temp_img.shape[0], : temp_img.shape[1], img] = temp_img
+
+    with ThreadPoolExecutor(max_workers=MAX_IMAGE_READ_WORKERS) as executor:
+        list(executor.map(_read_into_slot, jobs))
 
     # check to make sure that dtype wasn't too small for range of data
-    if np.min(img_data) < 0:
-        warnings.warn("You have images with negative values loaded in.")
+    _check_for_negative_values(img_data)
 
     row_coords, col_coords = range(img_data.shape[1]), range(img_data.shape[2])
 
@@ -275,18 +379,23 @@ def load_imgs_from_dir(
     if len(imgs) == 0:
         raise ValueError(f"No images found in directory, {data_dir}")
 
-    test_img = io.imread(os.path.join(data_dir, imgs[0]))
+    test_img = _imread(os.path.join(data_dir, imgs[0]))
 
     # check data format
     multitiff = test_img.ndim == 3
-    channels_first = multitiff and test_img.shape[0] == min(test_img.shape)
+    channels_first = False
 
     # check to make sure all channel indices are valid given the shape of the image
     n_channels = 1
     if multitiff:
-        n_channels = test_img.shape[0] if channels_first else test_img.shape[2]
+        n_pages, n_mid, n_last = test_img.shape
+        # the channel axis is the smallest one; comparing directly avoids re-scanning
+        # the shape tuple
+        channels_first = n_pages <= n_mid and n_pages <= n_last
+        n_channels = n_pages if channels_first else n_last
         if channel_indices:
-            if max(channel_indices) >= n_channels or min(channel_indices) < 0:
+            # one pass over the indices instead of separate min/max scans
+            if any(idx < 0 or idx >= n_channels for idx in channel_indices):
                 raise ValueError(
                     "Invalid value for channel_indices. Indices should be"
                     f" between 0-{n_channels-1} for the given data."
@@ -302,25 +411,35 @@ def load_imgs_from_dir(
     # The dtype is always the type of the image being loaded in.
     dtype = test_img.dtype
 
-    # extract data
-    img_data = []
-    for img in imgs:
-        v = io.imread(os.path.join(data_dir, img))
+    if channels_first:
+        n_rows, n_cols = test_img.shape[1], test_img.shape[2]
+    else:
+        n_rows, n_cols = test_img.shape[0], test_img.shape[1]
+
+    # subset each file right after decode so the output buffer never carries the
+    # unused channels
+    keep_indices = channel_indices if (channel_indices and multitiff) else None
+    n_channels_out = len(keep_indices) if keep_indices else n_channels
+
+    # extract data, reading the images in parallel into a pre-allocated output buffer
+    # rather than stacking (and copying) the per-fov arrays afterwards
+    img_data = np.empty((len(imgs), n_rows, n_cols, n_channels_out), dtype=dtype)
+
+    def _read_img(fov):
+        v = _imread(os.path.join(data_dir, imgs[fov]))
         if not multitiff:
             v = np.expand_dims(v, axis=2)
         elif channels_first:
             # covert channels_first to be channels_last
             v = np.moveaxis(v, 0, -1)
-        img_data.append(v)
-    img_data = np.stack(img_data, axis=0)
+        if keep_indices:
+            v = v[..., keep_indices]
+        img_data[fov] = v
 
-    img_data = img_data.astype(dtype)
+    with ThreadPoolExecutor(max_workers=MAX_IMAGE_READ_WORKERS) as executor:
+        list(executor.map(_read_img, range(len(imgs))))
 
-    if channel_indices and multitiff:
-        img_data = img_data[:, :, :, channel_indices]
-
-    if np.min(img_data) < 0:
-        warnings.warn("You have images with negative values loaded in.")
+    _check_for_negative_values(img_data)
 
     if channels_first:
         row_coords, col_coords = range(test_img.shape[1]), range(test_img.shape[2])
@@ -358,12 +477,9 @@ def check_fov_name_prefix(fov_list):
     # dict containing fov name and run name
     fov_names = {}
     for folder in fov_list:
-        fov = "".join(folder.split("_")[-1:])
-        prefix_name = "_".join(folder.split("_")[:-1])
-        if prefix_name in fov_names.keys():
-            fov_names[prefix_name].append(fov)
-        else:
-            fov_names[prefix_name] = [fov]
+        # one pass from the right: everything before the last '_' is the prefix
+        prefix_name, _, fov = folder.rpartition("_")
+        fov_names.setdefault(prefix_name, []).append(fov)
 
     return fov_names
 
@@ -385,29 +501,21 @@ def get_tiled_fov_names(fov_list, return_dims=False):
 
     # check for run name prefixes
     tiled_fov_names = check_fov_name_prefix(fov_list)
-    prefixes = tiled_fov_names.keys()
-    search_term: re.Pattern = re.compile(r"R\+?(\d+)C\+?(\d+)")
 
     # get expected names for each tile
-    for tile in prefixes:
-        rows, cols, expected_fovs = [], [], []
-        fov_names = tiled_fov_names[tile]
-        # get tiled image dimensions
+    for tile, fov_names in tiled_fov_names.items():
+        # get tiled image dimensions, parsing each fov exactly once
+        row_num, col_num = 0, 0
         for fov in fov_names:
-            R, C = re.search(search_term, fov).group(1, 2)
-            rows.append(int(R))
-            cols.append(int(C))
-        row_num, col_num = max(rows), max(cols)
-
-        # fill list of expected fov names
-        for n in range(row_num):
-            for m in range(col_num):
-                fov = f"R{n + 1}C{m + 1}"
-                # prepend run names
-                if tile == "":
-                    expected_fovs.append(fov)
-                else:
-                    expected_fovs.append(f"{tile}_" + fov)
+            R, C = _TILED_FOV_RE.match(fov).group(1, 2)
+            row_num = max(row_num, int(R))
+            col_num = max(col_num, int(C))
+
+        # fill list of expected fov names, prepending run names
+        prefix = f"{tile}_" if tile else ""
+        expected_fovs = [
+            f"{prefix}R{n + 1}C{m + 1}" for n in range(row_num) for m in range(col_num)
+        ]
 
         if return_dims:
             expected_tiles.append((tile, expected_fovs, row_num, col_num))
@@ -453,44 +561,51 @@ def load_tiled_img_data(
         fov_list = fovs
         tiled_names = []
 
+    # the channel file name is constant across fovs, build it once
+    channel_file = f"{channel}.{file_ext}"
+
     # missing fov directories, read in a test image to get data type
     if single_dir:
-        test_path = os.path.join(data_dir, fov_list[0] + "_" + channel + "." + file_ext)
+        test_path = os.path.join(data_dir, f"{fov_list[0]}_{channel_file}")
     else:
-        test_path = os.path.join(
-            os.path.join(data_dir, fov_list[0], img_sub_folder, channel + "." + file_ext)
-        )
-    test_img = io.imread(test_path)
+        test_path = os.path.join(data_dir, fov_list[0], img_sub_folder, channel_file)
+    test_img = _imread(test_path)
     img_data = np.zeros(
         (len(expected_fovs), test_img.shape[0], test_img.shape[1], 1), dtype=test_img.dtype
     )
 
+    # collect the on-disk path for each expected fov up front, leaving missing fovs as
+    # zeros; sets make the per-fov membership checks O(1)
+    fov_set, tiled_name_set = set(fov_list), set(tiled_names)
+    jobs = []
     for fov, fov_name in enumerate(expected_fovs):
-        # load in fov data for images, leave missing fovs as zeros
-        if fov_name in fov_list:
+        if fov_name in fov_set:
             if single_dir:
-                temp_img = io.imread(
-                    os.path.join(data_dir, fov_name + "_" + channel + "." + file_ext)
-                )
+                path = os.path.join(data_dir, f"{fov_name}_{channel_file}")
             else:
-                temp_img = io.imread(
-                    os.path.join(data_dir, fov_name, img_sub_folder, channel + "." + file_ext)
-                )
-            # fill in specific spot in array
-            img_data[fov, : temp_img.shape[0], : temp_img.shape[1], 0] = temp_img
+                path = os.path.join(data_dir, fov_name, img_sub_folder, channel_file)
 
         # check against tiled_names from dict for toffy dirs
-        elif fov_name in tiled_names:
-            folder_name = fovs[fov_name]
-            temp_img = io.imread(
-                os.path.join(data_dir, folder_name, img_sub_folder, channel + "." + file_ext)
-            )
-            # fill in specific spot in array
+        elif fov_name in tiled_name_set:
+            path = os.path.join(data_dir, fovs[fov_name], img_sub_folder, channel_file)
+        else:
+            continue
+        jobs.append((fov, path))
+
+    # submit the whole batch of reads at once; worker threads keep decoding while the
+    # main thread copies each tile into its specific spot as soon as it completes,
+    # rather than consuming tiles in submission order
+    def _read_tile(job):
+        fov, path = job
+        return fov, _imread(path)
+
+    with ThreadPoolExecutor(max_workers=MAX_IMAGE_READ_WORKERS) as executor:
+        for future in as_completed([executor.submit(_read_tile, job) for job in jobs]):
+            fov, temp_img = future.result()
             img_data[fov, : temp_img.shape[0], : temp_img.shape[1], 0] = temp_img
 
     # check to make sure that dtype wasn't too small for range of data
-    if np.min(img_data) < 0:
-        warnings.warn("You have images with negative values loaded in.")
+    _check_for_negative_values(img_data)
 
     row_coords, col_coords = range(img_data.shape[1]), range(img_data.shape[2])
 
@@ -532,15 +647,33 @@ def fov_to_ome(
 
     io_utils.validate_paths([data_dir, ome_save_dir])
 
-    # Reorder the DataArray as OME-TIFFs require [Channel, Y, X]
-    fov_xr: xr.DataArray = load_imgs_from_tree(
-        data_dir=data_dir, img_sub_folder=img_sub_folder, fovs=fovs, channels=channels
-    ).transpose("fovs", "channels", "rows", "cols")
+    if fovs is None:
+        # get all fovs
+        fovs = io_utils.list_folders(data_dir)
+        fovs.sort()
+
+    if len(fovs) == 0:
+        raise ValueError(f"No fovs found in directory, {data_dir}")
+
+    if channels is None:
+        # resolve the channel list once from the first FOV and reuse it for every
+        # per-FOV load, so FOVs with differing channel sets error instead of each
+        # silently converting its own set
+        channels = io_utils.list_files(
+            dir_name=os.path.join(data_dir, fovs[0], img_sub_folder or ""),
+            substrs=EXTENSION_TYPES["IMAGE"],
+        )
+        channels.sort()
 
     _compression: dict = {"algorithm": "zlib", "args": {"level": 6}}
 
-    for fov in fov_xr:
-        fov_name: str = fov.fovs.values
+    # Load and convert one FOV at a time, so peak memory is a single FOV's channel stack
+    # rather than the whole tree. Reorder each DataArray as OME-TIFFs require [Channel, Y, X]
+    for fov_name in fovs:
+        fov: xr.DataArray = load_imgs_from_tree(
+            data_dir=data_dir, img_sub_folder=img_sub_folder, fovs=[fov_name], channels=channels
+        ).transpose("fovs", "channels", "rows", "cols")[0]
+
         ome_file_path: pathlib.Path = pathlib.Path(ome_save_dir) / f"{fov_name}.ome.tiff"
 
         # Set metadata for the OME-TIFF
@@ -611,11 +744,21 @@ def ome_to_fov(ome: Union[str, pathlib.Path], data_dir: Union[str, pathlib.Path]
         # Get the TIFF pages for the current image
         ome_tiff_img_pages: TiffPageSeries = ome_tiff.series[0].pages
 
-        for ome_tiff_page, channel in zip(ome_tiff_img_pages, channels):
-            save_dir.mkdir(parents=True, exist_ok=True)
+        save_dir.mkdir(parents=True, exist_ok=True)
 
+        # Decode the pages sequentially: they share the one TiffFile handle, whose
+        # seek+read pairs are not synchronized across threads. Re-compressing and
+        # writing the channels is independent per file and zlib releases the GIL,
+        # so only that half runs on the pool.
+        def _save_channel(data_and_channel):
+            channel_data, channel = data_and_channel
             image_utils.save_image(
                 fname=save_dir / f"{channel}.tiff",
-                data=ome_tiff_page.asarray(),
+                data=channel_data,
                 compression_level=6,
             )
+
+        channel_arrays = [page.asarray() for page in ome_tiff_img_pages]
+
+        with ThreadPoolExecutor(max_workers=MAX_IMAGE_READ_WORKERS) as executor:
+            list(executor.map(_save_channel, zip(channel_arrays, channels)))
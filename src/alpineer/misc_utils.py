@@ -1,6 +1,7 @@
 import os
 import warnings
 from collections.abc import Iterable
+from functools import lru_cache
 from typing import Any
 
 import matplotlib.pyplot as plt
@@ -31,20 +32,13 @@ def save_figure(save_dir, save_file, dpi=None):
     plt.savefig(os.path.join(save_dir, save_file), dpi=dpi)
 
 
-def create_invalid_data_str(invalid_data):
-    """Creates a easy to read string for ValueError statements.
-
-    Args:
-        invalid_data (list[str]): A list of strings containing the invalid / missing data
-
-    Returns:
-        str: Returns a formatted string for more detailed ValueError outputs.
-    """
+@lru_cache(maxsize=256)
+def _format_invalid_data(invalid_data):
+    """Formats a tuple of invalid values, one numbered line per value"""
     # Holder for the error string
     err_str_data = ""
 
-    # Adding up to 10 invalid values to the err_str_data.
-    for idx, data in enumerate(invalid_data[:10], start=1):
+    for idx, data in enumerate(invalid_data, start=1):
         err_msg = "{idx:{fill}{align}{width}} {message}\n".format(
             idx=idx,
             message=data,
@@ -57,6 +51,20 @@ def create_invalid_data_str(invalid_data):
     return err_str_data
 
 
+def create_invalid_data_str(invalid_data):
+    """Creates a easy to read string for ValueError statements.
+
+    Args:
+        invalid_data (list[str]): A list of strings containing the invalid / missing data
+
+    Returns:
+        str: Returns a formatted string for more detailed ValueError outputs.
+    """
+    # repeated validation failures tend to carry the same bad values, so cache on the
+    # displayed (first 10) items; the tuple stays unsorted to preserve output order
+    return _format_invalid_data(tuple(invalid_data[:10]))
+
+
 def make_iterable(a: Any, ignore_str: bool = True):
     """Convert noniterable type to singleton in list
 
@@ -70,12 +78,15 @@ def make_iterable(a: Any, ignore_str: bool = True):
         List[T]:
             a as singleton in list, or a if a was already iterable.
     """
-    return (
-        a
-        if isinstance(a, Iterable)
-        and not ((isinstance(a, str) and ignore_str) or isinstance(a, type))
-        else [a]
-    )
+    # common containers pass straight through on a single isinstance check
+    if isinstance(a, (list, tuple, np.ndarray)):
+        return a
+    if isinstance(a, str):
+        return [a] if ignore_str else a
+    # classes are iterable-looking but are treated as values, like any non-iterable
+    if isinstance(a, type) or not isinstance(a, Iterable):
+        return [a]
+    return a
 
 
 def verify_in_list(warn: bool = False, **kwargs) -> bool:
@@ -114,9 +125,11 @@ def verify_in_list(warn: bool = False, **kwargs) -> bool:
     if len(rhs_list) == 0:
         raise ValueError(f"The list {lhs_name} is empty.")
 
-    if not np.isin(lhs_list, rhs_list).all():
-        # Calculate the difference between the `lhs_list` and the `rhs_list`
-        difference = [str(val) for val in lhs_list if val not in rhs_list]
+    membership_mask = np.isin(lhs_list, rhs_list)
+    if not membership_mask.all():
+        # Calculate the difference between the `lhs_list` and the `rhs_list`, reusing
+        # the isin mask instead of re-scanning rhs_list per element
+        difference = [str(val) for val, found in zip(lhs_list, membership_mask) if not found]
 
         # Only printing up to the first 10 invalid values.
         err_str = (
@@ -180,15 +193,18 @@ def verify_same_elements(enforce_order=False, warn=False, **kwargs) -> bool:
     list_one_name = list_one_name.replace("_", " ")
     list_two_name = list_two_name.replace("_", " ")
 
-    if not np.all(set(list_one_cast) == set(list_two_cast)):
+    # build each set once and derive every difference from the pair
+    set_one, set_two = set(list_one_cast), set(list_two_cast)
+
+    if set_one != set_two:
         # Values in list one that are not in list two
-        missing_vals_1 = [str(val) for val in (set(list_one_cast) - set(list_two_cast))]
+        missing_vals_1 = [str(val) for val in (set_one - set_two)]
 
         # Values in list two that are not in list one
-        missing_vals_2 = [str(val) for val in (set(list_two_cast) - set(list_one_cast))]
+        missing_vals_2 = [str(val) for val in (set_two - set_one)]
 
         # Total missing values
-        missing_vals_total = [str(val) for val in set(list_one_cast) ^ set(list_two_cast)]
+        missing_vals_total = missing_vals_1 + missing_vals_2
 
         err_str = (
             "{0} value(s) provided for list {1:^} and list {2:^} are not found in both lists.\n"
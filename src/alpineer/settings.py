@@ -1,7 +1,10 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 EXTENSION_TYPES: Dict[str, List[str]] = {
     "IMAGE": ["tiff", "tif", "png", "jpg", "jpeg", "ome.tiff"],
     "ARCHIVE": ["tar", "gz", "zip"],
     "DATA": ["csv", "feather", "bin", "json"],
 }
+
+# frozen once at import so str.endswith can consume it without per-call tuple rebuilds
+IMAGE_EXT_TUPLE: Tuple[str, ...] = tuple(EXTENSION_TYPES["IMAGE"])
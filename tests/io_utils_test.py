@@ -7,6 +7,12 @@ import pytest
 from alpineer import io_utils
 
 
+def _touch_many(root, names):
+    """Creates empty files under root with one open/close syscall pair per name"""
+    for name in names:
+        os.close(os.open(os.path.join(root, name), os.O_CREAT | os.O_WRONLY, 0o644))
+
+
 def test_validate_paths():
     # make a tempdir for testing
     with tempfile.TemporaryDirectory() as valid_path:
@@ -74,58 +80,56 @@ def test_list_files():
             "._fov-1-scan-1.json",
             "._fov-1-scan-1_pulse_heights.csv",
         ]
-        for filename in filenames:
-            pathlib.Path(os.path.join(temp_dir, filename)).touch()
+        _touch_many(temp_dir, filenames)
 
         # add extra folder (shouldn't be picked up)
         os.mkdir(os.path.join(temp_dir, "badfolder_test"))
 
         # test substrs is None (default)
         get_all = io_utils.list_files(temp_dir)
-        assert sorted(get_all) == sorted(["tf.txt", "othertf.txt", "test.out", "test.csv"])
+        assert get_all == sorted(["tf.txt", "othertf.txt", "test.out", "test.csv"])
 
         # test substrs is not list (single string)
         get_txt = io_utils.list_files(temp_dir, substrs=".txt")
-        assert sorted(get_txt) == sorted(["othertf.txt", "tf.txt"])
+        assert get_txt == sorted(["othertf.txt", "tf.txt"])
 
         # test substrs is list
         get_test_and_other = io_utils.list_files(temp_dir, substrs=[".txt", ".out"])
-        assert sorted(get_test_and_other) == sorted(["tf.txt", "othertf.txt", "test.out"])
+        assert get_test_and_other == sorted(["tf.txt", "othertf.txt", "test.out"])
 
         # Test hidden files
         get_hidden_files = io_utils.list_files(
             temp_dir, substrs=["fov-1"], exact_match=False, ignore_hidden=False
         )
-        assert sorted(get_hidden_files) == sorted(
+        assert get_hidden_files == sorted(
             ["._fov-1-scan-1.json", "._fov-1-scan-1_pulse_heights.csv"]
         )
 
     # test file name exact matching
     with tempfile.TemporaryDirectory() as temp_dir:
         filenames = [".chan-metadata.tiff", "chan0.tiff", "chan.tiff", "c.tiff"]
-        for filename in filenames:
-            pathlib.Path(os.path.join(temp_dir, filename)).touch()
+        _touch_many(temp_dir, filenames)
 
         # add extra folder (shouldn't be picked up)
         os.mkdir(os.path.join(temp_dir, "badfolder_test"))
 
         # test substrs is None (default)
         get_all = io_utils.list_files(temp_dir, exact_match=True)
-        assert sorted(get_all) == sorted(["chan0.tiff", "chan.tiff", "c.tiff"])
+        assert get_all == sorted(["chan0.tiff", "chan.tiff", "c.tiff"])
 
         # test substrs is not list (single string)
         get_txt = io_utils.list_files(temp_dir, substrs="c", exact_match=True)
-        assert sorted(get_txt) == [filenames[3]]
+        assert get_txt == [filenames[3]]
 
         # test substrs is list
         get_test_and_other = io_utils.list_files(temp_dir, substrs=["c", "chan"], exact_match=True)
-        assert sorted(get_test_and_other) == sorted(["chan.tiff", "c.tiff"])
+        assert get_test_and_other == sorted(["chan.tiff", "c.tiff"])
 
         # Test hidden files
         get_hidden_files = io_utils.list_files(
             temp_dir, substrs=[".chan-metadata"], exact_match=True, ignore_hidden=False
         )
-        assert sorted(get_hidden_files) == [".chan-metadata.tiff"]
+        assert get_hidden_files == [".chan-metadata.tiff"]
 
     # test delimiter functionality of substr matching
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -140,16 +144,15 @@ def test_list_files():
             "fov3_test.tiff",
             "fov30.tiff",
         ]
-        for filename in filenames:
-            pathlib.Path(os.path.join(temp_dir, filename)).touch()
+        _touch_many(temp_dir, filenames)
 
         # test substrs is not list (single string)
         get_txt = io_utils.list_files(temp_dir, substrs="fov1")
-        assert sorted(get_txt) == sorted(["fov1.tiff", "fov1_test.tiff"])
+        assert get_txt == sorted(["fov1.tiff", "fov1_test.tiff"])
 
         # test substrs is list
         get_test_and_other = io_utils.list_files(temp_dir, substrs=["fov1", "fov2"])
-        assert sorted(get_test_and_other) == sorted(
+        assert get_test_and_other == sorted(
             ["fov1.tiff", "fov1_test.tiff", "fov2.tiff", "fov2_test.tiff"]
         )
 
@@ -215,23 +218,23 @@ def test_list_folders():
             os.mkdir(os.path.join(temp_dir, dirname))
 
         # add extra file
-        pathlib.Path(os.path.join(temp_dir, "test_badfile.txt")).touch()
+        _touch_many(temp_dir, ["test_badfile.txt"])
 
         # test substrs is None (default)
         get_all = io_utils.list_folders(temp_dir, exact_match=False)
-        assert sorted(get_all) == sorted(
+        assert get_all == sorted(
             ["tf_txt", "othertf_txt", "test_csv", "test_out", "test_csv1", "test_csv2", "Ntest_csv"]
         )
 
         # test substrs is not list (single string)
         get_txt = io_utils.list_folders(temp_dir, substrs="_txt", exact_match=False)
-        assert sorted(get_txt) == sorted(["othertf_txt", "tf_txt"])
+        assert get_txt == sorted(["othertf_txt", "tf_txt"])
 
         # test substrs is list
         get_test_and_other = io_utils.list_folders(
             temp_dir, substrs=["test_", "other"], exact_match=False
         )
-        assert sorted(get_test_and_other) == sorted(
+        assert get_test_and_other == sorted(
             ["test_csv", "test_csv1", "test_csv2", "test_out"]
         )
 
@@ -245,7 +248,7 @@ def test_list_folders():
 
         # Test substrs is None (default)
         get_all = io_utils.list_folders(temp_dir, exact_match=True)
-        assert sorted(get_all) == sorted(
+        assert get_all == sorted(
             ["tf_txt", "othertf_txt", "test_csv", "test_out", "test_csv1", "test_csv2", "Ntest_csv"]
         )
         # Test exact substr is not list (single string)
@@ -256,7 +259,7 @@ def test_list_folders():
         get_exact_n_substrs = io_utils.list_folders(
             temp_dir, substrs=["tf_txt", "othertf_txt"], exact_match=True
         )
-        assert sorted(get_exact_n_substrs) == ["othertf_txt", "tf_txt"]
+        assert get_exact_n_substrs == ["othertf_txt", "tf_txt"]
 
         # Test the substr that the user specifies which is contained within multiple folders,
         # and only the folder that exactly matches the substring, not the one that contains it,
@@ -290,12 +293,12 @@ def test_list_folders():
 
         # test substrs is not list (single string)
         get_txt = io_utils.list_folders(temp_dir, substrs="test1", exact_match=False)
-        assert sorted(get_txt) == sorted(["test1", "test1_folder"])
+        assert get_txt == sorted(["test1", "test1_folder"])
 
         # test substrs is list
         get_test_and_other = io_utils.list_folders(
             temp_dir, substrs=["test1", "test2"], exact_match=False
         )
-        assert sorted(get_test_and_other) == sorted(
+        assert get_test_and_other == sorted(
             ["test1", "test1_folder", "test2", "test2_folder"]
         )
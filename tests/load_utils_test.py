@@ -10,9 +10,9 @@ import pytest
 import xarray as xr
 import xmltodict
 from skimage import io
-from tifffile import TiffFile, TiffWriter
+from tifffile import TiffFile, TiffWriter, imwrite
 
-from alpineer import load_utils, test_utils
+from alpineer import image_utils, load_utils, test_utils
 
 
 def test_load_imgs_from_mibitiff():
@@ -188,6 +188,36 @@ def test_load_imgs_from_tree():
 
         assert loaded_xr.shape == (3, 12, 12, 3)
 
+        # without max_image_size, the largest image on disk determines the padded shape
+        image_utils.save_image(
+            os.path.join(temp_dir, "fov0", "TIFs", "chan0.tiff"),
+            np.zeros((8, 8), dtype="int16"),
+        )
+
+        loaded_xr = load_utils.load_imgs_from_tree(temp_dir, img_sub_folder="TIFs")
+
+        assert loaded_xr.shape == (3, 10, 10, 3)
+
+    # test loading uncompressed images: the multi-channel (strided) destination slices
+    # can't be decoded into directly
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fovs, chans = test_utils.gen_fov_chan_names(num_fovs=2, num_chans=2)
+
+        for fov in fovs:
+            os.makedirs(os.path.join(temp_dir, fov, "TIFs"))
+            for chan in chans:
+                imwrite(
+                    os.path.join(temp_dir, fov, "TIFs", f"{chan}.tiff"),
+                    np.full((10, 10), fovs.index(fov) * 2 + chans.index(chan), dtype="int16"),
+                )
+
+        loaded_xr = load_utils.load_imgs_from_tree(temp_dir, img_sub_folder="TIFs")
+
+        assert loaded_xr.shape == (2, 10, 10, 2)
+        for fov in range(2):
+            for chan in range(2):
+                assert (loaded_xr.values[fov, :, :, chan] == fov * 2 + chan).all()
+
 
 def test_load_imgs_from_dir():
     # invalid directory is provided